@@ -0,0 +1,189 @@
+import base64
+import logging
+import orjson
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+ROLE_EMAILS = {
+    "employee": "employee@waqtech.com",
+    "hr": "hr@waqtech.com",
+    "admin": "admin@waqtech.com",
+}
+
+# Login payloads never change, so encode them once instead of per login
+LOGIN_BODIES = {
+    role: orjson.dumps({"email": email, "password": "password123"})
+    for role, email in ROLE_EMAILS.items()
+}
+
+INVALID_LOGIN_BODY = orjson.dumps({"email": "nonexistent@waqtech.com", "password": "wrongpassword"})
+
+def role_label(role):
+    return "HR" if role == "hr" else role.capitalize()
+
+def load_json(response):
+    """Decode a response body with orjson, skipping requests' text round-trip"""
+    return orjson.loads(response.content)
+
+class TimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request it sends"""
+    
+    def __init__(self, *args, timeout=10, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+    
+    def send(self, request, **kwargs):
+        # Session.send always passes timeout, as None when the caller gave none
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+# Tokens survive between local runs so iterative reruns skip the logins
+TOKEN_CACHE_PATH = Path(__file__).resolve().parent / ".pytest_cache" / "waqtech_tokens.json"
+_token_cache_lock = threading.Lock()
+
+def _token_expiry(token):
+    """Return a JWT's exp claim without verifying its signature"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = orjson.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (IndexError, ValueError, AttributeError):
+        return None
+    return exp if isinstance(exp, (int, float)) else None
+
+def _read_token_cache():
+    try:
+        cache = orjson.loads(TOKEN_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def load_cached_tokens(base_url):
+    """Return cached role tokens for base_url that stay valid for another minute"""
+    entries = _read_token_cache().get(base_url)
+    if not isinstance(entries, dict):
+        return {}
+    
+    # Entries in an unexpected shape are treated as cache misses
+    deadline = time.time() + 60
+    valid = {}
+    for role, entry in entries.items():
+        try:
+            access_token, user_id = entry["access_token"], entry["user_id"]
+        except (KeyError, TypeError):
+            continue
+        if (_token_expiry(access_token) or 0) > deadline:
+            valid[role] = {"access_token": access_token, "user_id": user_id}
+    return valid
+
+def store_cached_tokens(base_url, entries):
+    # gather threads can relogin and store at once: the lock keeps one role's
+    # update from dropping another's, and each writer gets its own temp file
+    with _token_cache_lock:
+        cache = _read_token_cache()
+        cache[base_url] = entries
+        TOKEN_CACHE_PATH.parent.mkdir(exist_ok=True)
+        tmp_path = TOKEN_CACHE_PATH.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(cache))
+        tmp_path.replace(TOKEN_CACHE_PATH)
+
+def gather(*calls):
+    """Run zero-argument callables concurrently and return their results in order"""
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        return list(executor.map(lambda call: call(), calls))
+
+def demo_data_seeded(demo_init_response):
+    """Whether /demo/init recreated the demo users, invalidating cached logins"""
+    body = demo_init_response.get("body")
+    return isinstance(body, dict) and "users" in body
+
+def login_role(session, login_url, role):
+    """Log role in and return its access token and user id, or None on failure"""
+    response = session.post(login_url, data=LOGIN_BODIES[role])
+    if response.status_code != 200:
+        return None
+    data = load_json(response)
+    return {"access_token": data["access_token"], "user_id": data["user"]["id"]}
+
+def login_roles(session, login_url, base_url, use_cache=True):
+    """Map each role that logged in to its access token and user id"""
+    # Reuse tokens from a previous run while they stay valid, then log in
+    # the remaining roles concurrently; each login costs one round-trip
+    logins = load_cached_tokens(base_url) if use_cache else {}
+    for role in logins:
+        log.info("✅ %s token reused from cache", role_label(role))
+    
+    roles = [role for role in ROLE_EMAILS if role not in logins]
+    if roles:
+        entries = gather(*(partial(login_role, session, login_url, role) for role in roles))
+        for role, entry in zip(roles, entries):
+            if entry is not None:
+                logins[role] = entry
+                log.info("✅ %s login successful during setup", role_label(role))
+        
+        store_cached_tokens(base_url, logins)
+    return logins
+
+def relogin_on_401(role_session, http_session, login_url, role, on_login):
+    """Log role in again and retry once when role_session's token is rejected"""
+    # Concurrent 401s share one login; a second login could invalidate the first token
+    relogin_lock = threading.Lock()
+    
+    def _hook(response, **kwargs):
+        if response.status_code != 401 or getattr(response.request, "_relogin_retry", False):
+            return response
+        with relogin_lock:
+            if role_session.headers.get("Authorization") == response.request.headers.get("Authorization"):
+                entry = login_role(http_session, login_url, role)
+                if entry is None:
+                    return response
+                
+                log.info("✅ %s token rejected, logged in again", role_label(role))
+                on_login(role, entry)
+                role_session.headers["Authorization"] = f"Bearer {entry['access_token']}"
+            authorization = role_session.headers["Authorization"]
+        request = response.request.copy()
+        request.headers["Authorization"] = authorization
+        request._relogin_retry = True
+        return role_session.send(request, **kwargs)
+    
+    role_session.hooks["response"].append(_hook)
+
+# Response checks shared by the live and mocked suites so their assertions
+# cannot drift apart; conftest.py registers this module for assert rewriting
+
+def check_demo_init(demo_init_response):
+    """Assert a /demo/init outcome and return its body"""
+    assert demo_init_response["status_code"] == 200
+    data = demo_init_response["body"]
+    assert "message" in data
+    
+    # Demo data might already exist, which is fine; otherwise users were seeded
+    if "Demo data already exists" not in data["message"]:
+        assert "users" in data
+    return data
+
+def check_employee_profile(data, employee_id):
+    """Assert the employee profile belongs to employee_id"""
+    assert data["id"] == employee_id
+    assert data["role"] == "employee"
+
+def check_leave_balance(data):
+    """Assert the leave balance structure and its accrual arithmetic"""
+    # Verify leave balance structure
+    assert "total_days" in data
+    assert "used_days" in data
+    assert "remaining_days" in data
+    assert "months_worked" in data
+    
+    # Verify leave balance calculation
+    assert data["total_days"] == data["months_worked"] * 2
+    assert data["remaining_days"] == data["total_days"] - data["used_days"]
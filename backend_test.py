@@ -1,249 +1,142 @@
-import requests
-import unittest
-import json
+import logging
+import orjson
+import pytest
+import sys
 from datetime import datetime, timedelta
 
-class WaqTechAPITest(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Use the public endpoint from frontend/.env
-        cls.base_url = "https://b2d9cebd-7c7f-4774-b8b4-176ec60e24bf.preview.emergentagent.com/api"
-        cls.tokens = {}
-        cls.user_ids = {}
-        cls.leave_request_id = None
-        
-        # Initialize demo data
-        print("\n🔍 Setting up test data...")
-        response = requests.post(f"{cls.base_url}/demo/init")
-        
-        # Login as employee
-        response = requests.post(
-            f"{cls.base_url}/auth/login",
-            json={"email": "employee@waqtech.com", "password": "password123"}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            cls.tokens["employee"] = data["access_token"]
-            cls.user_ids["employee"] = data["user"]["id"]
-            print("✅ Employee login successful during setup")
-        
-        # Login as HR
-        response = requests.post(
-            f"{cls.base_url}/auth/login",
-            json={"email": "hr@waqtech.com", "password": "password123"}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            cls.tokens["hr"] = data["access_token"]
-            cls.user_ids["hr"] = data["user"]["id"]
-            print("✅ HR login successful during setup")
-        
-        # Login as admin
-        response = requests.post(
-            f"{cls.base_url}/auth/login",
-            json={"email": "admin@waqtech.com", "password": "password123"}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            cls.tokens["admin"] = data["access_token"]
-            cls.user_ids["admin"] = data["user"]["id"]
-            print("✅ Admin login successful during setup")
+from api_helpers import gather, load_json
+
+log = logging.getLogger(__name__)
+
+# The workflow fixtures are module-scoped, and each xdist worker would build
+# its own copy and spend another leave day on the live backend; keep the whole
+# module on one worker (conftest.py switches pytest -n to --dist loadgroup)
+pytestmark = [pytest.mark.integration, pytest.mark.xdist_group("leave_workflow")]
+
+# Leave dates are fixed for the run, so format them once up front
+_now = datetime.utcnow()
+_week_out = _now + timedelta(days=7)
+FUTURE_DATE_ISO = f"{_week_out.year:04d}-{_week_out.month:02d}-{_week_out.day:02d}T00:00:00.000Z"
+FAR_FUTURE = _now + timedelta(days=14)
+FAR_FUTURE_ISO = FAR_FUTURE.isoformat()
+
+@pytest.fixture(scope="module")
+def created_leave_request(sessions, tokens, urls):
+    """Create a 1-day leave request for the employee and return it"""
+    if "employee" not in tokens:
+        pytest.skip("Employee token not available")
     
-    def setUp(self):
-        # This method is intentionally left empty as we're using setUpClass
-        pass
-        
-    def test_01_initialize_demo_data(self):
-        """Test initializing demo data"""
-        print("\n🔍 Testing demo data initialization...")
-        response = requests.post(f"{self.base_url}/demo/init")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn("message", data)
-        
-        # Demo data might already exist, which is fine
-        if "Demo data already exists" in data["message"]:
-            print("✅ Demo data already exists")
-        else:
-            self.assertIn("users", data)
-            print("✅ Demo data initialization successful")
-        
-    def test_02_get_employee_profile(self):
-        """Test getting employee profile"""
-        print("\n🔍 Testing employee profile retrieval...")
-        if "employee" not in self.tokens:
-            self.skipTest("Employee token not available")
-            
-        headers = {"Authorization": f"Bearer {self.tokens['employee']}"}
-        response = requests.get(f"{self.base_url}/user/profile", headers=headers)
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["id"], self.user_ids["employee"])
-        self.assertEqual(data["role"], "employee")
-        print("✅ Employee profile retrieval successful")
-        
-    def test_03_get_leave_balance(self):
-        """Test getting leave balance"""
-        print("\n🔍 Testing leave balance retrieval...")
-        if "employee" not in self.tokens:
-            self.skipTest("Employee token not available")
-            
-        headers = {"Authorization": f"Bearer {self.tokens['employee']}"}
-        response = requests.get(f"{self.base_url}/leave/balance", headers=headers)
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        # Verify leave balance structure
-        self.assertIn("total_days", data)
-        self.assertIn("used_days", data)
-        self.assertIn("remaining_days", data)
-        self.assertIn("months_worked", data)
-        
-        # Verify leave balance calculation
-        self.assertEqual(data["total_days"], data["months_worked"] * 2)
-        self.assertEqual(data["remaining_days"], data["total_days"] - data["used_days"])
-        print("✅ Leave balance retrieval successful")
-        
-    def test_04_create_leave_request(self):
-        """Test creating a leave request"""
-        print("\n🔍 Testing leave request creation...")
-        if "employee" not in self.tokens:
-            self.skipTest("Employee token not available")
-            
-        headers = {"Authorization": f"Bearer {self.tokens['employee']}"}
-        
-        # Get current leave balance
-        balance_response = requests.get(f"{self.base_url}/leave/balance", headers=headers)
-        self.assertEqual(balance_response.status_code, 200)
-        balance = balance_response.json()
-        
-        # Create a leave request for 1 day
-        start_date = (datetime.utcnow() + timedelta(days=7)).strftime("%Y-%m-%d")
-        end_date = (datetime.utcnow() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        response = requests.post(
-            f"{self.base_url}/leave/request",
-            headers=headers,
-            json={
-                "start_date": f"{start_date}T00:00:00.000Z",
-                "end_date": f"{end_date}T00:00:00.000Z",
-                "reason": "Test leave request"
-            }
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn("id", data)
-        self.assertEqual(data["user_id"], self.user_ids["employee"])
-        self.assertEqual(data["status"], "pending")
-        self.assertEqual(data["days_requested"], 1)
-        
-        # Store leave request ID for later tests
-        self.__class__.leave_request_id = data["id"]
-        print("✅ Leave request creation successful")
-        
-    def test_05_get_leave_requests(self):
-        """Test getting leave requests"""
-        print("\n🔍 Testing leave requests retrieval...")
-        if "employee" not in self.tokens:
-            self.skipTest("Employee token not available")
-            
-        headers = {"Authorization": f"Bearer {self.tokens['employee']}"}
-        response = requests.get(f"{self.base_url}/leave/requests", headers=headers)
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        # Verify it's a list and contains at least one request
-        self.assertIsInstance(data, list)
-        self.assertGreaterEqual(len(data), 1)
-        
-        # Verify the request we just created is in the list
-        if self.__class__.leave_request_id:
-            request_ids = [req["id"] for req in data]
-            self.assertIn(self.__class__.leave_request_id, request_ids)
-        print("✅ Leave requests retrieval successful")
-        
-    def test_06_hr_approve_leave_request(self):
-        """Test HR approving a leave request"""
-        print("\n🔍 Testing HR approval of leave request...")
-        if "hr" not in self.tokens or not self.__class__.leave_request_id:
-            self.skipTest("HR token or leave request ID not available")
-            
-        headers = {"Authorization": f"Bearer {self.tokens['hr']}"}
-        response = requests.put(
-            f"{self.base_url}/leave/requests/{self.__class__.leave_request_id}",
-            headers=headers,
-            json={"status": "approved"}
-        )
-        
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["id"], self.__class__.leave_request_id)
-        self.assertEqual(data["status"], "approved")
-        self.assertEqual(data["reviewed_by"], self.user_ids["hr"])
-        print("✅ HR approval of leave request successful")
-        
-    def test_07_verify_updated_leave_balance(self):
-        """Test that leave balance is updated after approval"""
-        print("\n🔍 Testing updated leave balance...")
-        if "employee" not in self.tokens:
-            self.skipTest("Employee token not available")
-            
-        headers = {"Authorization": f"Bearer {self.tokens['employee']}"}
-        response = requests.get(f"{self.base_url}/leave/balance", headers=headers)
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        
-        # Verify used_days has increased by 1
-        self.assertGreaterEqual(data["used_days"], 1)
-        print("✅ Leave balance update verification successful")
-        
-    def test_08_invalid_login(self):
-        """Test login with invalid credentials"""
-        print("\n🔍 Testing invalid login...")
-        response = requests.post(
-            f"{self.base_url}/auth/login",
-            json={"email": "nonexistent@waqtech.com", "password": "wrongpassword"}
-        )
-        self.assertEqual(response.status_code, 401)
-        print("✅ Invalid login test successful")
-        
-    def test_09_insufficient_leave_balance(self):
-        """Test creating a leave request with insufficient balance"""
-        print("\n🔍 Testing leave request with insufficient balance...")
-        if "employee" not in self.tokens:
-            self.skipTest("Employee token not available")
-            
-        headers = {"Authorization": f"Bearer {self.tokens['employee']}"}
-        
-        # Get current leave balance
-        balance_response = requests.get(f"{self.base_url}/leave/balance", headers=headers)
-        self.assertEqual(balance_response.status_code, 200)
-        balance = balance_response.json()
-        
-        # Try to create a leave request for more days than available
-        excessive_days = balance["remaining_days"] + 10
-        start_date = datetime.utcnow() + timedelta(days=14)
-        end_date = start_date + timedelta(days=excessive_days)
-        
-        response = requests.post(
-            f"{self.base_url}/leave/request",
-            headers=headers,
-            json={
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
-                "reason": "Test excessive leave request"
-            }
-        )
-        
-        self.assertEqual(response.status_code, 400)
-        data = response.json()
-        self.assertIn("detail", data)
-        self.assertIn("Insufficient leave balance", data["detail"])
-        print("✅ Insufficient leave balance test successful")
+    response = sessions["employee"].post(
+        urls["leave_request"],
+        data=orjson.dumps({
+            "start_date": FUTURE_DATE_ISO,
+            "end_date": FUTURE_DATE_ISO,
+            "reason": "Test leave request"
+        })
+    )
+    assert response.status_code == 200, response.text
+    return load_json(response)
 
-if __name__ == "__main__":
-    unittest.main(verbosity=2)
+@pytest.fixture(scope="module")
+def listing_and_approval(sessions, tokens, urls, created_leave_request):
+    """List the employee's leave requests and approve the new one as HR"""
+    # Both calls depend only on the created request's id, so issue them
+    # together; the backend has no batch endpoint to fold them into
+    def list_requests():
+        return sessions["employee"].get(urls["leave_requests"])
+    
+    if "hr" not in tokens:
+        return list_requests(), None
+    return tuple(gather(
+        list_requests,
+        lambda: sessions["hr"].put(
+            f"{urls['leave_requests']}/{created_leave_request['id']}",
+            data=orjson.dumps({"status": "approved"})
+        ),
+    ))
+
+@pytest.fixture(scope="module")
+def approved_leave_request(listing_and_approval):
+    """Return the leave request as updated by the HR approval"""
+    _, response = listing_and_approval
+    if response is None:
+        pytest.skip("HR token not available")
+    
+    assert response.status_code == 200, response.text
+    return load_json(response)
+
+def test_create_leave_request(created_leave_request, user_ids):
+    """Test creating a leave request"""
+    log.info("🔍 Testing leave request creation...")
+    data = created_leave_request
+    assert "id" in data
+    assert data["user_id"] == user_ids["employee"]
+    assert data["status"] == "pending"
+    assert data["days_requested"] == 1
+    log.info("✅ Leave request creation successful")
+    
+def test_get_leave_requests(created_leave_request, listing_and_approval):
+    """Test getting leave requests"""
+    log.info("🔍 Testing leave requests retrieval...")
+    response, _ = listing_and_approval
+    assert response.status_code == 200
+    data = load_json(response)
+    
+    # Verify it's a list and contains the request we created
+    assert isinstance(data, list)
+    assert len(data) >= 1
+    request_ids = [req["id"] for req in data]
+    assert created_leave_request["id"] in request_ids
+    log.info("✅ Leave requests retrieval successful")
+    
+def test_hr_approve_leave_request(created_leave_request, approved_leave_request, user_ids):
+    """Test HR approving a leave request"""
+    log.info("🔍 Testing HR approval of leave request...")
+    data = approved_leave_request
+    assert data["id"] == created_leave_request["id"]
+    assert data["status"] == "approved"
+    assert data["reviewed_by"] == user_ids["hr"]
+    log.info("✅ HR approval of leave request successful")
+    
+def test_verify_updated_leave_balance(sessions, urls, approved_leave_request):
+    """Test that leave balance is updated after approval"""
+    log.info("🔍 Testing updated leave balance...")
+    response = sessions["employee"].get(urls["balance"])
+    assert response.status_code == 200, response.text
+    
+    # Verify used_days has increased by 1
+    assert load_json(response)["used_days"] >= 1
+    log.info("✅ Leave balance update verification successful")
+    
+def test_insufficient_leave_balance(sessions, tokens, urls):
+    """Test creating a leave request with insufficient balance"""
+    log.info("🔍 Testing leave request with insufficient balance...")
+    if "employee" not in tokens:
+        pytest.skip("Employee token not available")
+        
+    # Get current leave balance; this needs only the employee, not the approval
+    balance_response = sessions["employee"].get(urls["balance"])
+    assert balance_response.status_code == 200
+    balance = load_json(balance_response)
+    
+    # Try to create a leave request for more days than available
+    excessive_days = balance["remaining_days"] + 10
+    end_date = FAR_FUTURE + timedelta(days=excessive_days)
+    
+    response = sessions["employee"].post(
+        urls["leave_request"],
+        data=orjson.dumps({
+            "start_date": FAR_FUTURE_ISO,
+            "end_date": end_date.isoformat(),
+            "reason": "Test excessive leave request"
+        })
+    )
+    
+    assert response.status_code == 400
+    data = load_json(response)
+    assert "detail" in data
+    assert "Insufficient leave balance" in data["detail"]
+    log.info("✅ Insufficient leave balance test successful")
 
 if __name__ == "__main__":
-    unittest.main(verbosity=2)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v", "-m", "integration"]))
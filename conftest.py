@@ -0,0 +1,150 @@
+import logging
+import orjson
+import os
+import pytest
+import requests
+import time
+from urllib3.util.retry import Retry
+
+pytest.register_assert_rewrite("api_helpers")
+
+from api_helpers import (
+    ROLE_EMAILS,
+    TimeoutAdapter,
+    demo_data_seeded,
+    load_json,
+    login_roles,
+    relogin_on_401,
+    store_cached_tokens,
+)
+
+log = logging.getLogger(__name__)
+
+def pytest_configure(config):
+    # Under pytest -n, upgrade xdist's default --dist load to loadgroup so
+    # backend_test.py's leave workflow stays on a single worker; other --dist
+    # modes are kept, and runs without xdist never see the option. Workers
+    # re-parse the command line, so they are told through workerinput instead
+    if getattr(config.option, "dist", "no") == "load":
+        config.option.dist = "loadgroup"
+    if getattr(config, "workerinput", {}).get("waqtech_loadgroup"):
+        config.option.loadgroup = True
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["waqtech_loadgroup"] = node.config.getvalue("dist") == "loadgroup"
+
+@pytest.fixture(scope="session")
+def base_url():
+    # Use the public endpoint from frontend/.env
+    return "https://b2d9cebd-7c7f-4774-b8b4-176ec60e24bf.preview.emergentagent.com/api"
+
+@pytest.fixture(scope="session")
+def urls(base_url):
+    # Build every endpoint once; only the approval URL is still formatted per call
+    return {
+        "demo_init": f"{base_url}/demo/init",
+        "login": f"{base_url}/auth/login",
+        "profile": f"{base_url}/user/profile",
+        "balance": f"{base_url}/leave/balance",
+        "leave_request": f"{base_url}/leave/request",
+        "leave_requests": f"{base_url}/leave/requests",
+    }
+
+@pytest.fixture(scope="session")
+def http_session():
+    # Share one session so every call reuses the same keep-alive connection
+    session = requests.Session()
+    # requests already sends Connection: keep-alive by default; it is listed
+    # here only to make the header explicit, it does not change behaviour
+    session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+    
+    # Retry transient gateway errors on a pooled connection instead of
+    # surfacing them as flaky tests, and fail fast on a stalled endpoint
+    adapter = TimeoutAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.1,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset(["GET", "POST", "PUT"])
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
+
+@pytest.fixture(scope="session")
+def demo_init_response(http_session, urls, tmp_path_factory):
+    """POST /demo/init once per test run and return its status code and body"""
+    def _post_demo_init():
+        log.info("🔍 Setting up test data...")
+        response = http_session.post(urls["demo_init"])
+        body = load_json(response) if response.status_code == 200 else None
+        return {"status_code": response.status_code, "body": body}
+    
+    if "PYTEST_XDIST_WORKER" not in os.environ:
+        return _post_demo_init()
+    
+    # Under pytest-xdist the first worker to claim the lockfile in the shared
+    # base temp dir seeds and publishes the outcome; the others wait for it
+    shared_dir = tmp_path_factory.getbasetemp().parent
+    lock_path = shared_dir / "waqtech-demo-init.lock"
+    result_path = shared_dir / "waqtech-demo-init.json"
+    try:
+        os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        deadline = time.monotonic() + 60
+        while not result_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if result_path.exists():
+            return orjson.loads(result_path.read_bytes())
+    
+    result = _post_demo_init()
+    tmp_path = result_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(orjson.dumps(result))
+    tmp_path.replace(result_path)
+    return result
+
+@pytest.fixture(scope="session")
+def logins(http_session, base_url, urls, demo_init_response):
+    """Map each role that logged in to its access token and user id"""
+    # Freshly seeded demo users get new ids and tokens, so a cache from an
+    # earlier run would only hand out stale ones
+    use_cache = not demo_data_seeded(demo_init_response)
+    return login_roles(http_session, urls["login"], base_url, use_cache=use_cache)
+
+@pytest.fixture(scope="session")
+def tokens(logins):
+    return {role: entry["access_token"] for role, entry in logins.items()}
+
+@pytest.fixture(scope="session")
+def user_ids(logins):
+    return {role: entry["user_id"] for role, entry in logins.items()}
+
+@pytest.fixture(scope="session")
+def sessions(http_session, base_url, urls, logins, tokens, user_ids):
+    # Role-scoped sessions carry the bearer token once login succeeds and
+    # ride the shared session's adapters, so they reuse its connection pool
+    def on_login(role, entry):
+        # A cached token was rejected before its expiry; keep every view of
+        # the logins in step with the fresh one
+        logins[role] = entry
+        tokens[role] = entry["access_token"]
+        user_ids[role] = entry["user_id"]
+        store_cached_tokens(base_url, logins)
+    
+    sessions = {}
+    for role in ROLE_EMAILS:
+        session = requests.Session()
+        session.headers.update(http_session.headers)
+        session.adapters = http_session.adapters
+        if role in logins:
+            session.headers["Authorization"] = f"Bearer {logins[role]['access_token']}"
+        relogin_on_401(session, http_session, urls["login"], role, on_login)
+        sessions[role] = session
+    yield sessions
+    for session in sessions.values():
+        session.close()
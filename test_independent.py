@@ -0,0 +1,51 @@
+import logging
+import pytest
+import sys
+
+from api_helpers import (
+    INVALID_LOGIN_BODY,
+    check_demo_init,
+    check_employee_profile,
+    check_leave_balance,
+    gather,
+    load_json,
+)
+
+log = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.integration
+
+def test_initialize_demo_data(demo_init_response):
+    """Test initializing demo data"""
+    log.info("🔍 Testing demo data initialization...")
+    data = check_demo_init(demo_init_response)
+    if "Demo data already exists" in data["message"]:
+        log.info("✅ Demo data already exists")
+    else:
+        log.info("✅ Demo data initialization successful")
+    
+def test_independent_reads(urls, http_session, sessions, tokens, user_ids):
+    """Test invalid login, employee profile and leave balance in one concurrent round"""
+    log.info("🔍 Testing invalid login, profile and leave balance retrieval...")
+    bad_login, profile_response, balance_response = gather(
+        lambda: http_session.post(urls["login"], data=INVALID_LOGIN_BODY),
+        lambda: sessions["employee"].get(urls["profile"]),
+        lambda: sessions["employee"].get(urls["balance"]),
+    )
+    
+    assert bad_login.status_code == 401
+    log.info("✅ Invalid login test successful")
+    
+    if "employee" not in tokens:
+        pytest.skip("Employee token not available")
+        
+    assert profile_response.status_code == 200
+    check_employee_profile(load_json(profile_response), user_ids["employee"])
+    log.info("✅ Employee profile retrieval successful")
+    
+    assert balance_response.status_code == 200
+    check_leave_balance(load_json(balance_response))
+    log.info("✅ Leave balance retrieval successful")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-m", "integration"]))
@@ -0,0 +1,39 @@
+import pytest
+import responses
+from pathlib import Path
+
+import api_helpers
+from fake_waqtech import FAKE_BASE_URL, FakeBackend
+
+# The mocked suite overrides base_url only; every other fixture is the real
+# one from the root conftest.py. Session fixtures are cached per run and the
+# mock stays active for the whole session, so a run that selects both suites
+# is refused (the default -m "not integration" selects this one alone).
+
+UNIT_DIR = Path(__file__).resolve().parent
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    live_items = [item for item in items if UNIT_DIR not in Path(item.path).resolve().parents]
+    if live_items and len(live_items) < len(items):
+        raise pytest.UsageError(
+            f"tests/unit runs against a fake backend and cannot share a session with "
+            f"{live_items[0].nodeid}; run the live suite separately (pytest -m integration)"
+        )
+
+@pytest.fixture(scope="session")
+def base_url():
+    return FAKE_BASE_URL
+
+@pytest.fixture(scope="session", autouse=True)
+def token_cache_path(tmp_path_factory):
+    # Keep fake tokens out of the developer's real token cache
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        path = tmp_path_factory.mktemp("token-cache") / "waqtech_tokens.json"
+        monkeypatch.setattr(api_helpers, "TOKEN_CACHE_PATH", path)
+        yield path
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_backend(base_url, token_cache_path):
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        yield FakeBackend(mock, base_url)
@@ -0,0 +1,73 @@
+import base64
+import orjson
+import responses
+import threading
+import time
+
+FAKE_BASE_URL = "https://waqtech.test/api"
+
+FAKE_USER_IDS = {"employee": "u-employee", "hr": "u-hr", "admin": "u-admin"}
+
+def fake_jwt(role, expires_in=3600):
+    """Build an unsigned JWT carrying role and an exp claim"""
+    def encode(claims):
+        return base64.urlsafe_b64encode(orjson.dumps(claims)).rstrip(b"=").decode()
+    return f"{encode({'alg': 'none'})}.{encode({'sub': role, 'exp': time.time() + expires_in})}.sig"
+
+class FakeBackend:
+    """Stand-in for the WaqTech API that checks credentials and bearer tokens"""
+    
+    def __init__(self, mock, base_url):
+        self.mock = mock
+        self.demo_init_body = {"message": "Demo data already exists"}
+        self.issued = {}
+        self.login_bodies = []
+        self.rejection_barrier = None
+        mock.add_callback(responses.POST, f"{base_url}/demo/init", self._demo_init)
+        mock.add_callback(responses.POST, f"{base_url}/auth/login", self._login)
+        mock.add_callback(responses.GET, f"{base_url}/user/profile", self._profile)
+        mock.add_callback(responses.GET, f"{base_url}/leave/balance", self._balance)
+    
+    def revoke_tokens(self):
+        """Reject every token issued so far, as a reseeded backend would"""
+        self.issued.clear()
+    
+    def hold_rejections(self, parties):
+        """Make the next parties rejected reads wait for each other before answering 401"""
+        self.rejection_barrier = threading.Barrier(parties, timeout=5)
+    
+    def _reply(self, status, body):
+        return status, {"Content-Type": "application/json"}, orjson.dumps(body)
+    
+    def _role(self, request):
+        header = request.headers.get("Authorization", "")
+        role = next((role for role, token in self.issued.items() if header == f"Bearer {token}"), None)
+        if role is None and self.rejection_barrier is not None:
+            try:
+                self.rejection_barrier.wait()
+            finally:
+                self.rejection_barrier = None
+        return role
+    
+    def _demo_init(self, request):
+        return self._reply(200, self.demo_init_body)
+    
+    def _login(self, request):
+        self.login_bodies.append(request.body)
+        credentials = orjson.loads(request.body)
+        role = credentials["email"].split("@")[0]
+        if role not in FAKE_USER_IDS or credentials["password"] != "password123":
+            return self._reply(401, {"detail": "Invalid credentials"})
+        self.issued[role] = fake_jwt(role)
+        return self._reply(200, {"access_token": self.issued[role], "user": {"id": FAKE_USER_IDS[role]}})
+    
+    def _profile(self, request):
+        role = self._role(request)
+        if role is None:
+            return self._reply(401, {"detail": "Invalid token"})
+        return self._reply(200, {"id": FAKE_USER_IDS[role], "role": role})
+    
+    def _balance(self, request):
+        if self._role(request) is None:
+            return self._reply(401, {"detail": "Invalid token"})
+        return self._reply(200, {"total_days": 24, "used_days": 3, "remaining_days": 21, "months_worked": 12})
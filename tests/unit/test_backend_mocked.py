@@ -0,0 +1,125 @@
+import pytest
+
+from api_helpers import (
+    INVALID_LOGIN_BODY,
+    LOGIN_BODIES,
+    ROLE_EMAILS,
+    check_demo_init,
+    check_employee_profile,
+    check_leave_balance,
+    demo_data_seeded,
+    gather,
+    load_cached_tokens,
+    load_json,
+    login_roles,
+    store_cached_tokens,
+)
+from fake_waqtech import FAKE_USER_IDS, fake_jwt
+
+# Runs the suite's real fixtures and helpers against the fake backend from
+# tests/unit/conftest.py, with the same checks the live suite applies
+
+EXISTING_DEMO_DATA = {"message": "Demo data already exists"}
+SEEDED_DEMO_DATA = {"message": "Demo data initialized", "users": ["employee@waqtech.com"]}
+
+def test_demo_init_response(demo_init_response):
+    """Test the demo_init_response fixture decodes the /demo/init outcome"""
+    check_demo_init(demo_init_response)
+    assert not demo_data_seeded(demo_init_response)
+
+@pytest.mark.parametrize("body, seeded", [(EXISTING_DEMO_DATA, False), (SEEDED_DEMO_DATA, True)])
+def test_check_demo_init_accepts_both_server_responses(body, seeded):
+    """Test both /demo/init replies pass the shared check and are told apart"""
+    demo_init_response = {"status_code": 200, "body": body}
+    assert check_demo_init(demo_init_response) == body
+    assert demo_data_seeded(demo_init_response) is seeded
+
+def test_check_demo_init_rejects_seed_without_users():
+    """Test a seeding reply that lacks the seeded users fails the shared check"""
+    with pytest.raises(AssertionError):
+        check_demo_init({"status_code": 200, "body": {"message": "Demo data initialized"}})
+
+def test_logins_post_each_role_credentials(fake_backend, logins, user_ids):
+    """Test the logins fixture logs every role in with its pre-encoded body"""
+    assert set(logins) == set(ROLE_EMAILS)
+    assert user_ids == FAKE_USER_IDS
+    assert set(LOGIN_BODIES.values()) <= set(fake_backend.login_bodies)
+
+def test_invalid_login(http_session, urls):
+    """Test login with invalid credentials"""
+    response = http_session.post(urls["login"], data=INVALID_LOGIN_BODY)
+    assert response.status_code == 401
+
+def test_role_session_reads(sessions, urls, user_ids):
+    """Test the role sessions authenticate the profile and leave balance reads"""
+    profile_response, balance_response = gather(
+        lambda: sessions["employee"].get(urls["profile"]),
+        lambda: sessions["employee"].get(urls["balance"]),
+    )
+    assert profile_response.status_code == 200
+    check_employee_profile(load_json(profile_response), user_ids["employee"])
+    assert balance_response.status_code == 200
+    check_leave_balance(load_json(balance_response))
+
+def test_rejected_token_triggers_relogin(fake_backend, base_url, sessions, urls, tokens, user_ids):
+    """Test a role session logs in again and retries once its token is rejected"""
+    stale_token = tokens["employee"]
+    fake_backend.revoke_tokens()
+    
+    response = sessions["employee"].get(urls["profile"])
+    assert response.status_code == 200
+    check_employee_profile(load_json(response), user_ids["employee"])
+    assert tokens["employee"] != stale_token
+    assert load_cached_tokens(base_url)["employee"]["access_token"] == tokens["employee"]
+
+def test_concurrent_rejections_share_one_relogin(fake_backend, sessions, urls):
+    """Test concurrent 401s on one role session log in once and all retry with the new token"""
+    fake_backend.revoke_tokens()
+    fake_backend.hold_rejections(4)
+    logins_before = len(fake_backend.login_bodies)
+    
+    replies = gather(*[lambda: sessions["employee"].get(urls["balance"]) for _ in range(4)])
+    assert [reply.status_code for reply in replies] == [200] * 4
+    assert len(fake_backend.login_bodies) == logins_before + 1
+
+def test_concurrent_cache_writes_leave_a_readable_cache(base_url):
+    """Test cache writes from several threads never clash on the temp file"""
+    entry = {"access_token": fake_jwt("employee"), "user_id": "u-employee"}
+    gather(*[lambda: store_cached_tokens(base_url, {"employee": entry}) for _ in range(8)])
+    assert load_cached_tokens(base_url) == {"employee": entry}
+
+@pytest.mark.parametrize("timeout, expected", [(None, 10), (3, 3)])
+def test_timeout_adapter_defaults_the_timeout(fake_backend, http_session, urls, timeout, expected):
+    """Test the mounted TimeoutAdapter fills in a timeout only when none is given"""
+    http_session.post(urls["demo_init"], timeout=timeout)
+    assert fake_backend.mock.calls[-1].request.req_kwargs["timeout"] == expected
+
+def test_token_cache_round_trip(base_url):
+    """Test cached tokens are reused only while they stay valid for another minute"""
+    store_cached_tokens(base_url, {
+        "employee": {"access_token": fake_jwt("employee"), "user_id": "u-employee"},
+        "hr": {"access_token": fake_jwt("hr", expires_in=30), "user_id": "u-hr"},
+    })
+    assert set(load_cached_tokens(base_url)) == {"employee"}
+    assert load_cached_tokens("https://elsewhere.test/api") == {}
+
+@pytest.mark.parametrize("entries", [
+    {"employee": {"token": "missing-access-token"}},
+    {"employee": {"access_token": "not-a-jwt", "user_id": "u-employee"}},
+    {"employee": "not-a-dict"},
+    ["not", "a", "dict"],
+])
+def test_malformed_token_cache_is_a_miss(base_url, entries):
+    """Test cache entries in an unexpected shape are ignored instead of raising"""
+    store_cached_tokens(base_url, entries)
+    assert load_cached_tokens(base_url) == {}
+
+def test_login_roles_skips_cache_after_reseed(http_session, urls, base_url):
+    """Test fresh logins replace cached ids when the demo users were recreated"""
+    stale = {role: {"access_token": fake_jwt(role), "user_id": "stale"} for role in ROLE_EMAILS}
+    store_cached_tokens(base_url, stale)
+    assert login_roles(http_session, urls["login"], base_url) == stale
+    
+    fresh = login_roles(http_session, urls["login"], base_url, use_cache=False)
+    assert {role: entry["user_id"] for role, entry in fresh.items()} == FAKE_USER_IDS
+    assert load_cached_tokens(base_url) == fresh